@@ -1,16 +1,28 @@
+import asyncio
 import json
+import orjson
+import re
 import requests
+from requests.adapters import HTTPAdapter
 import gradio as gr
 from typing import List, Dict, Any, Tuple
 import os
 
 #from langchain_ollama import ChatOllama
-from langchain_google_genai import ChatGoogleGenerativeAI
+from google import genai
+from google.genai import types
+from rapidfuzz import fuzz, process, utils
 #MODEL = "llama3.2:latest"
 #MODEL = "qwen2.5:0.5b-instruct"
 
 API_URL = "https://pzvpngd6ij.execute-api.ap-southeast-5.amazonaws.com/dev/create"
 #API_URL = "http://127.0.0.1:8000/receive"
+
+# shared keep-alive session so repeat creations skip the TCP+TLS handshake
+SESSION = requests.Session()
+SESSION.headers.update({"Content-Type": "application/json"})
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 INDUSTRIES = [
     "Aerospace",
     "Education & Training",
@@ -20,13 +32,56 @@ INDUSTRIES = [
     "Robotics and Automation",
     "Urban Air Mobility (UAM)",
 ]
+INDUSTRIES_BULLETS = "\n".join(f"- {x}" for x in INDUSTRIES)
+INDUSTRIES_REPR = json.dumps(INDUSTRIES)
+
+# Optional local backend: point LLM_BASE_URL at an OpenAI-compatible llama.cpp server, e.g.
+#   ./llama-server -m qwen2.5-0.5b-instruct-q4_k_m.gguf --parallel 8 --cont-batching --host 127.0.0.1 --port 8080
+#   LLM_BASE_URL=http://127.0.0.1:8080/v1 python ui.py
+# Unset, the app uses Gemini as before.
+LLM_BASE_URL = os.getenv("LLM_BASE_URL")
+LOCAL_MODEL = os.getenv("LLM_MODEL", "qwen2.5-0.5b")
+GEMINI_MODEL = "gemini-2.5-flash-lite"
+
+# raw SDK clients, no LangChain message/Runnable layer in between
+if LLM_BASE_URL:
+    from openai import AsyncOpenAI
+    client = AsyncOpenAI(base_url=LLM_BASE_URL, api_key="none")
+else:
+    client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
+
+# every call returns a small JSON object, so ask the API for JSON directly
+# and cap the decode; QA answers (2–6 sentences) still fit in 256 tokens
+EXTRACT_MAX_TOKENS = 256
+# classifier only ever returns {"industry_name": "..."}
+CLASSIFY_MAX_TOKENS = 32
+
+
+async def _chat(system: str, user: str, max_tokens: int = EXTRACT_MAX_TOKENS) -> str:
+    """One JSON-mode, temperature-0 completion on whichever backend is configured."""
+    if LLM_BASE_URL:
+        resp = await client.chat.completions.create(
+            model=LOCAL_MODEL,
+            messages=[{"role": "system", "content": system}, {"role": "user", "content": user}],
+            temperature=0,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+        )
+        return (resp.choices[0].message.content or "").strip()
+
+    resp = await client.aio.models.generate_content(
+        model=GEMINI_MODEL,
+        contents=user,
+        config=types.GenerateContentConfig(
+            system_instruction=system,
+            temperature=0,
+            max_output_tokens=max_tokens,
+            response_mime_type="application/json",
+        ),
+    )
+    return (resp.text or "").strip()
+
 
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash-lite",
-    temperature=0,
-    google_api_key=os.getenv("GOOGLE_API_KEY"),
-    max_output_tokens=1024,
-)
 SYSTEM_EXTRACTOR = """
 You are a STRICT JSON assistant for an intake flow.
 
@@ -66,7 +121,7 @@ SYSTEM_INDUSTRY = f"""
 You are a STRICT industry classifier.
 
 Choose EXACTLY ONE industry from this list:
-{INDUSTRIES}
+{INDUSTRIES_REPR}
 
 Input: company_background (text)
 
@@ -79,7 +134,230 @@ No extra keys. No markdown. No text outside JSON.
 """
 
 
-def on_submit(user_input, messages, state):
+# industry_pick is one of 7 fixed labels: fuzzy-match locally, LLM only for questions/misses
+FUZZY_THRESHOLD = 90
+MIN_PICK_CHARS = 3
+QUESTION_RE = re.compile(r"^\s*(what|how|why|explain)\b", re.I)
+# "not aerospace" must not pick Aerospace; negations go to the LLM
+NEGATION_RE = re.compile(r"\b(?:not|no|non|never|except|nor|neither|isn't|aren't|don't|doesn't)\b", re.I)
+# connective words that appear inside labels ("Robotics and Automation") but
+# carry no choice on their own
+_FILLER_WORDS = frozenset({"a", "an", "and", "the", "of", "in", "for", "or"})
+
+
+def looks_like_question(text: str) -> bool:
+    return text.rstrip().endswith("?") or bool(QUESTION_RE.match(text))
+
+
+def match_industry(text: str) -> str:
+    """Best INDUSTRIES label for text, or "" if nothing scores above FUZZY_THRESHOLD."""
+    if NEGATION_RE.search(text):
+        return ""
+    query = " ".join(w for w in utils.default_process(text).split() if w not in _FILLER_WORDS)
+    if len(query) < MIN_PICK_CHARS:
+        return ""
+    # whole-token scorer: WRatio's partial matching rates any 3-letter substring ~90
+    hit = process.extractOne(query, INDUSTRIES, scorer=fuzz.token_set_ratio, processor=utils.default_process)
+    if hit and hit[1] >= FUZZY_THRESHOLD:
+        return hit[0]
+    return ""
+
+
+# pick_industry skips the confirm step, so a wrong match goes straight to the create API.
+# Checked at import so a later tweak to the matcher fails fast.
+_MATCH_INDUSTRY_CASES = {
+    "aerospace": "Aerospace",
+    "aero space": "Aerospace",
+    "medical": "Medical Devices",
+    "smart cities": "Smart Buildings-Cities",
+    "energy": "Energy Technology",
+    "robotics and automation": "Robotics and Automation",
+    "UAM": "Urban Air Mobility (UAM)",
+    "training": "Education & Training",
+    "not aerospace": "",
+    "oil and gas": "",
+    "cat": "",
+    "ing": "",
+    "ca": "",
+    "and": "",
+    "no": "",
+}
+for _text, _want in _MATCH_INDUSTRY_CASES.items():
+    assert match_industry(_text) == _want, (_text, match_industry(_text), _want)
+
+
+# "my company is Acme" / "customer name: Jane Tan" don't need a model; LLM only on a miss.
+# The lead-in is case-insensitive, but the value must be a short run of capitalized
+# words that ends the message, so "my company is building drones" or
+# "Acme and we do aerospace" still go to the LLM.
+# a dot stays with the word when another name word follows ("Pte. Ltd") or it closes
+# a company suffix ("Ltd."); otherwise it's sentence punctuation
+_NAME_WORD = r"[A-Z][\w&'\-]*(?:\.(?=\s+[A-Z])|(?<=Ltd|Inc|Bhd)\.|(?<=Co)\.)?"
+# capitalized pronouns/articles ("customer is Me", "company is An AI Startup") aren't names
+_NOT_A_NAME = r"(?!(?i:i|me|a|an|the|my|our|we|us|it|you|your|this|that)\b)"
+_NAME_TAIL = r"\s*" + _NOT_A_NAME + r"(" + _NAME_WORD + r"(?:\s+" + _NAME_WORD + r"){0,2})[\s.!]*$"
+COMPANY_RE = re.compile(
+    r"(?i:\bcompany(?:'s)?(?:\s+name)?(?:\s*:|\s+(?:is\s+called|called|named|is)\b))" + _NAME_TAIL
+)
+CUSTOMER_RE = re.compile(
+    r"(?i:\bcustomer(?:'s)?(?:\s+name)?(?:\s*:|\s+is\b))" + _NAME_TAIL
+)
+
+
+def regex_extract(pattern: "re.Pattern", text: str) -> str:
+    m = pattern.search(text)
+    return m.group(1).strip() if m else ""
+
+
+# reply -> value the fast path should return ("" means ask the LLM); checked at import
+_REGEX_EXTRACT_CASES = [
+    (COMPANY_RE, "my company is Acme Sdn Bhd", "Acme Sdn Bhd"),
+    (COMPANY_RE, "Our company's name is Stratiq.", "Stratiq"),
+    (COMPANY_RE, "company: Acme Pte. Ltd.", "Acme Pte. Ltd."),
+    (COMPANY_RE, "the company is called Foo Bar", "Foo Bar"),
+    (COMPANY_RE, "my company is Intel", "Intel"),
+    (COMPANY_RE, "my company is building drones", ""),
+    (COMPANY_RE, "My company is Acme and we do aerospace", ""),
+    (COMPANY_RE, "my company is not registered yet", ""),
+    (COMPANY_RE, "company is I", ""),
+    (COMPANY_RE, "our company is A", ""),
+    (COMPANY_RE, "Our company is An AI Startup", ""),
+    (COMPANY_RE, "company is THE BEST", ""),
+    (CUSTOMER_RE, "customer name is Jane Tan", "Jane Tan"),
+    (CUSTOMER_RE, "Customer: O'Brien-Smith", "O'Brien-Smith"),
+    (CUSTOMER_RE, "customer is me", ""),
+    (CUSTOMER_RE, "customer is Me", ""),
+    (CUSTOMER_RE, "my customer is for a demo", ""),
+]
+for _pattern, _text, _want in _REGEX_EXTRACT_CASES:
+    assert regex_extract(_pattern, _text) == _want, (_text, regex_extract(_pattern, _text), _want)
+
+
+# temperature=0 makes classification a pure function of the (normalized) text,
+# so a user retyping the same background after a "no" skips the LLM entirely
+CACHE_MAXSIZE = 1024
+_background_cache: Dict[str, dict] = {}  # normalized user_message -> fused intake result
+_industry_cache: Dict[str, str] = {}     # normalized company_background -> industry label
+
+
+def _norm_key(text: str) -> str:
+    return " ".join(text.split()).lower()
+
+
+def _cache_put(cache: Dict[str, Any], key: str, value: Any) -> None:
+    if len(cache) >= CACHE_MAXSIZE:
+        cache.pop(next(iter(cache)))  # dicts keep insertion order; drop the oldest
+    cache[key] = value
+
+
+# company_background extraction + industry classification in one round-trip
+SYSTEM_BACKGROUND = f"""
+You are a STRICT JSON assistant for an intake flow.
+
+Input: user_message (text), the user's reply when asked what their company does.
+
+Decide mode:
+- mode="qa" if user_message is a general question (e.g., "what is odoo", "how ERP works").
+- mode="intake" if user_message attempts to describe the company.
+
+QA mode:
+- Put the helpful answer (2–6 sentences) in "answer".
+- Set "value" = "" and "industry_name" = "".
+
+Intake mode:
+- Extract ONLY the company background into "value".
+- If user did not clearly describe the company, set "value" = "" and "industry_name" = "".
+- Otherwise choose EXACTLY ONE industry for "industry_name" from this list:
+{INDUSTRIES_REPR}
+  Choose the best match even if the background is short.
+
+Return ONLY valid JSON with EXACTLY these keys:
+{{
+  "mode": "qa" | "intake",
+  "answer": "",
+  "value": "",
+  "industry_name": ""
+}}
+No extra keys. No markdown. No text outside JSON.
+"""
+
+
+def _dumps(obj: Any) -> str:
+    # orjson is the hot-path serializer; json stays for the static prompt constants
+    return orjson.dumps(obj).decode()
+
+
+_YES = frozenset({"y", "yes", "yeah", "yep", "correct", "ya", "betul", "true"})
+_NO = frozenset({"n", "no", "nope", "tak", "tidak", "bukan", "false"})
+
+
+def is_yes(txt: str) -> bool:
+    return txt.strip().lower() in _YES
+
+
+def is_no(txt: str) -> bool:
+    return txt.strip().lower() in _NO
+
+
+def parse_json(raw: str) -> dict:
+    raw = (raw or "").strip()
+
+    # Fast path: JSON mode means the whole reply should already be an object
+    try:
+        data = orjson.loads(raw)
+        if isinstance(data, dict):
+            return data
+    except Exception:
+        pass
+
+    # Fallback: extract first JSON object if present
+    start, end = raw.find("{"), raw.rfind("}")
+    if start != -1 and end != -1 and end > start:
+        try:
+            return orjson.loads(raw[start:end + 1])
+        except Exception:
+            pass
+
+    # If no JSON found, return a safe fallback dict instead of crashing
+    # This prevents Gradio worker from dying
+    return {
+        "mode": "qa",
+        "answer": f"(server) Model returned non-JSON output:\n{raw[:500]}",
+        "value": ""
+    }
+
+
+async def llm_extract(expected_field: str, text: str) -> dict:
+    payload = {"expected_field": expected_field, "user_message": text}
+    raw = await _chat(SYSTEM_EXTRACTOR, _dumps(payload))
+    return parse_json(raw)
+
+
+async def llm_extract_background(text: str) -> dict:
+    key = _norm_key(text)
+    if key in _background_cache:
+        return dict(_background_cache[key])
+    raw = await _chat(SYSTEM_BACKGROUND, text)
+    data = parse_json(raw)
+    # only cache usable intake answers, never QA replies or fallbacks
+    if data.get("mode") == "intake" and (data.get("value") or "").strip() and data.get("industry_name") in INDUSTRIES:
+        _cache_put(_background_cache, key, dict(data))
+    return data
+
+
+async def llm_classify_industry(background: str) -> str:
+    key = _norm_key(background)
+    if key in _industry_cache:
+        return _industry_cache[key]
+    raw = await _chat(SYSTEM_INDUSTRY, background, CLASSIFY_MAX_TOKENS)
+    data = parse_json(raw)
+    industry = (data.get("industry_name") or "").strip()
+    if industry in INDUSTRIES:
+        _cache_put(_industry_cache, key, industry)
+    return industry
+
+
+async def handle_turn(user_input, messages, state):
     messages = messages or []
     state = state or {
         "step": "ask_company_name",
@@ -97,65 +375,6 @@ def on_submit(user_input, messages, state):
 
     messages.append({"role": "user", "content": user_input})
 
-    def parse_json(raw: str) -> dict:
-        raw = (raw or "").strip()
-
-        # Fast path: extract first JSON object if present
-        start, end = raw.find("{"), raw.rfind("}")
-        if start != -1 and end != -1 and end > start:
-            try:
-                return json.loads(raw[start:end + 1])
-            except Exception:
-                pass
-
-        # If no JSON found, return a safe fallback dict instead of crashing
-        # This prevents Gradio worker from dying
-        return {
-            "mode": "qa",
-            "answer": f"(server) Model returned non-JSON output:\n{raw[:500]}",
-            "value": ""
-        }
-
-    def llm_extract(expected_field: str, text: str) -> dict:
-        payload = {"expected_field": expected_field, "user_message": text}
-        msg = llm.invoke([("system", SYSTEM_EXTRACTOR), ("human", json.dumps(payload))])
-        raw = content_to_text(msg.content).strip()
-        return parse_json(raw)
-
-    def llm_classify_industry(background: str) -> str:
-        msg = llm.invoke([("system", SYSTEM_INDUSTRY), ("human", background)])
-        raw = content_to_text(msg.content).strip()
-        data = parse_json(raw)
-        return (data.get("industry_name") or "").strip()
-    def content_to_text(content) -> str:
-        """LangChain message content can be str or list (multi-part). Normalize to str."""
-        if content is None:
-            return ""
-        if isinstance(content, str):
-            return content
-        if isinstance(content, list):
-            out = []
-            for part in content:
-                # common shapes: {"type":"text","text":"..."} or plain strings
-                if isinstance(part, str):
-                    out.append(part)
-                elif isinstance(part, dict):
-                    if "text" in part and isinstance(part["text"], str):
-                        out.append(part["text"])
-                    elif "content" in part and isinstance(part["content"], str):
-                        out.append(part["content"])
-            return "\n".join(out)
-        return str(content)
-
-
-    def is_yes(txt: str) -> bool:
-        t = txt.strip().lower()
-        return t in {"y", "yes", "yeah", "yep", "correct", "ya", "betul", "true"}
-
-    def is_no(txt: str) -> bool:
-        t = txt.strip().lower()
-        return t in {"n", "no", "nope", "tak", "tidak", "bukan", "false"}
-
     # optional reset after creation
     if state.get("created"):
         state.update({
@@ -174,13 +393,15 @@ def on_submit(user_input, messages, state):
 
 
     if step == "ask_company_name":
-        data = llm_extract("company_name", user_input)
-        if data["mode"] == "qa":
-            messages.append({"role": "assistant", "content": data["answer"].strip()})
-            messages.append({"role": "assistant", "content": "Now, what’s your company name?"})
-            return messages, state
+        name = "" if looks_like_question(user_input) else regex_extract(COMPANY_RE, user_input)
+        if not name:
+            data = await llm_extract("company_name", user_input)
+            if data["mode"] == "qa":
+                messages.append({"role": "assistant", "content": data["answer"].strip()})
+                messages.append({"role": "assistant", "content": "Now, what’s your company name?"})
+                return messages, state
 
-        name = (data.get("value") or "").strip()
+            name = (data.get("value") or "").strip()
         if not name:
             messages.append({"role": "assistant", "content": "What company name should I use? (You can give a placeholder.)"})
             return messages, state
@@ -192,7 +413,7 @@ def on_submit(user_input, messages, state):
 
 
     if step == "ask_background":
-        data = llm_extract("company_background", user_input)
+        data = await llm_extract_background(user_input)
         if data["mode"] == "qa":
             messages.append({"role": "assistant", "content": data["answer"].strip()})
             messages.append({"role": "assistant", "content": "Back to intake: what does your company do (1–2 sentences)?"})
@@ -205,14 +426,16 @@ def on_submit(user_input, messages, state):
 
         state["company_background"] = bg
 
-        # LLM #2 classification (always one of 7)
-        industry = llm_classify_industry(bg)
+        # industry comes back with the background; only re-classify if it's off-list
+        industry = (data.get("industry_name") or "").strip()
+        if industry not in INDUSTRIES:
+            industry = await llm_classify_industry(bg)
 
         # hard guard in case model misbehaves
         if industry not in INDUSTRIES:
             messages.append({
                 "role": "assistant",
-                "content": "I couldn’t classify reliably. Please choose one:\n" + "\n".join([f"- {x}" for x in INDUSTRIES])
+                "content": "I couldn’t classify reliably. Please choose one:\n" + INDUSTRIES_BULLETS
             })
             state["step"] = "pick_industry"
             return messages, state
@@ -225,13 +448,7 @@ def on_submit(user_input, messages, state):
 
 
     if step == "confirm_industry":
-        # allow QA without advancing
-        gate = llm_extract("industry_pick", user_input)
-        if gate["mode"] == "qa":
-            messages.append({"role": "assistant", "content": gate["answer"].strip()})
-            messages.append({"role": "assistant", "content": f"Back to intake: is **{state['industry_name']}** correct? (yes/no)"})
-            return messages, state
-
+        # plain yes/no never needs the LLM
         if is_yes(user_input):
             state["industry_confirmed"] = True
             state["step"] = "ask_customer_name"
@@ -242,22 +459,31 @@ def on_submit(user_input, messages, state):
             state["industry_name"] = ""
             state["industry_confirmed"] = False
             state["step"] = "pick_industry"
-            messages.append({"role": "assistant", "content": "Okay — choose one industry:\n" + "\n".join([f"- {x}" for x in INDUSTRIES])})
+            messages.append({"role": "assistant", "content": "Okay — choose one industry:\n" + INDUSTRIES_BULLETS})
+            return messages, state
+
+        # allow QA without advancing
+        gate = await llm_extract("industry_pick", user_input)
+        if gate["mode"] == "qa":
+            messages.append({"role": "assistant", "content": gate["answer"].strip()})
+            messages.append({"role": "assistant", "content": f"Back to intake: is **{state['industry_name']}** correct? (yes/no)"})
             return messages, state
 
         messages.append({"role": "assistant", "content": "Please reply **yes** or **no**."})
         return messages, state
 
     if step == "pick_industry":
-        data = llm_extract("industry_pick", user_input)
-        if data["mode"] == "qa":
-            messages.append({"role": "assistant", "content": data["answer"].strip()})
-            messages.append({"role": "assistant", "content": "Now, please choose one industry:\n" + "\n".join([f"- {x}" for x in INDUSTRIES])})
-            return messages, state
-
-        pick = (data.get("value") or "").strip()
+        pick = "" if looks_like_question(user_input) else match_industry(user_input)
+        if not pick:
+            data = await llm_extract("industry_pick", user_input)
+            if data["mode"] == "qa":
+                messages.append({"role": "assistant", "content": data["answer"].strip()})
+                messages.append({"role": "assistant", "content": "Now, please choose one industry:\n" + INDUSTRIES_BULLETS})
+                return messages, state
+
+            pick = (data.get("value") or "").strip()
         if pick not in INDUSTRIES:
-            messages.append({"role": "assistant", "content": "Please pick exactly one:\n" + "\n".join([f"- {x}" for x in INDUSTRIES])})
+            messages.append({"role": "assistant", "content": "Please pick exactly one:\n" + INDUSTRIES_BULLETS})
             return messages, state
 
         state["industry_name"] = pick
@@ -267,29 +493,32 @@ def on_submit(user_input, messages, state):
         return messages, state
 
     if step == "ask_customer_name":
-        data = llm_extract("customer_name", user_input)
-        if data["mode"] == "qa":
-            messages.append({"role": "assistant", "content": data["answer"].strip()})
-            messages.append({"role": "assistant", "content": "Back to intake: what customer name should I create the simulator instance for?"})
-            return messages, state
+        customer = "" if looks_like_question(user_input) else regex_extract(CUSTOMER_RE, user_input)
+        if not customer:
+            data = await llm_extract("customer_name", user_input)
+            if data["mode"] == "qa":
+                messages.append({"role": "assistant", "content": data["answer"].strip()})
+                messages.append({"role": "assistant", "content": "Back to intake: what customer name should I create the simulator instance for?"})
+                return messages, state
 
-        customer = (data.get("value") or "").strip()
+            customer = (data.get("value") or "").strip()
         if not customer:
             messages.append({"role": "assistant", "content": "What customer name should I create the simulator instance for?"})
             return messages, state
 
         if not state.get("industry_confirmed") or state.get("industry_name") not in INDUSTRIES:
             state["step"] = "pick_industry"
-            messages.append({"role": "assistant", "content": "Before creating, choose one industry:\n" + "\n".join([f"- {x}" for x in INDUSTRIES])})
+            messages.append({"role": "assistant", "content": "Before creating, choose one industry:\n" + INDUSTRIES_BULLETS})
             return messages, state
 
         state["customer_name"] = customer
 
         try:
-            r = requests.post(
+            # run the blocking POST off the event loop so other sessions keep going
+            r = await asyncio.to_thread(
+                SESSION.post,
                 API_URL,
                 json={"customer_name": state["customer_name"], "industry_name": state["industry_name"]},
-                headers={"Content-Type": "application/json"},
                 timeout=30,
             )
             r.raise_for_status()
@@ -316,6 +545,40 @@ def on_submit(user_input, messages, state):
     state["created"] = True
     return messages, state
 
+async def on_submit(user_input, messages, state):
+    # async generator: Gradio renders each yield, so the user's message shows up
+    # immediately instead of after the whole LLM round-trip
+    # the first yield also clears the textbox; the last leaves it alone so
+    # anything typed during the round-trip isn't wiped
+    messages = messages or []
+    text = (user_input or "").strip()
+    if text:
+        yield messages + [{"role": "user", "content": text}], state, ""
+    messages, state = await handle_turn(user_input, messages, state)
+    yield messages, state, gr.update()
+
+
+_warmed = False
+
+
+async def warmup_llms():
+    """Fire one throwaway call per system prompt so the first real turn doesn't pay connection setup."""
+    global _warmed
+    if _warmed:
+        return
+    _warmed = True
+    await asyncio.gather(
+        _chat(SYSTEM_EXTRACTOR, _dumps({"expected_field": "company_name", "user_message": "warmup"})),
+        _chat(SYSTEM_BACKGROUND, "warmup"),
+        _chat(SYSTEM_INDUSTRY, "warmup", CLASSIFY_MAX_TOKENS),
+        return_exceptions=True,
+    )
+
+# sessions allowed inside on_submit at once (Gradio's per-listener default is 1)
+SUBMIT_CONCURRENCY = 8
+
+SKIP_EMPTY_JS = "(text, history, state) => { if (!(text || '').trim()) throw new Error('empty'); return [text, history, state]; }"
+
 #the ui part is here 
 with gr.Blocks(title="Odoo Simulator Chat") as demo:
     gr.Markdown("## Odoo Simulator Chat")
@@ -332,8 +595,20 @@ with gr.Blocks(title="Odoo Simulator Chat") as demo:
         None,
         [chatbot, state],
     )
-
-    msg.submit(on_submit, inputs=[msg, chatbot, state], outputs=[chatbot, state]).then(lambda: "", None, msg)
+    demo.load(warmup_llms, None, None)
+
+    # on_submit is an async generator, so Gradio streams its yields. Gradio runs one
+    # call per listener at a time by default; concurrency_limit lets up to
+    # SUBMIT_CONCURRENCY sessions await the LLM at once.
+    # Blank input is rejected in the browser before it reaches the server. Repeat Enter
+    # presses mid-turn are already dropped by .submit()'s default trigger_mode="once".
+    msg.submit(
+        on_submit,
+        inputs=[msg, chatbot, state],
+        outputs=[chatbot, state, msg],
+        js=SKIP_EMPTY_JS,
+        concurrency_limit=SUBMIT_CONCURRENCY,
+    )
 
 #demo.launch()
 demo.launch(server_name="127.0.0.1",server_port=7860)